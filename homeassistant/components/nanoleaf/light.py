@@ -1,7 +1,10 @@
 """Support for Nanoleaf Lights."""
+import asyncio
+import json
 import logging
 
-from pynanoleaf import Nanoleaf, Unavailable
+import aiohttp
+from pynanoleaf import Nanoleaf, NanoleafError, Unavailable
 import voluptuous as vol
 
 from homeassistant.components.light import (
@@ -19,6 +22,7 @@ from homeassistant.components.light import (
     LightEntity,
 )
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_TOKEN
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import color as color_util
 from homeassistant.util.color import (
@@ -36,6 +40,30 @@ CONFIG_FILE = ".nanoleaf.conf"
 
 ICON = "mdi:triangle-outline"
 
+RECONNECT_INTERVAL = 30
+
+# The event stream is silent while the light state is unchanged, so a socket
+# that died without a FIN is indistinguishable from a quiet one. Re-establish
+# the connection whenever nothing arrives for this long; the resync on
+# reconnect surfaces a dead device
+STREAM_READ_TIMEOUT = 300
+
+# Event stream identifiers and attributes from the Nanoleaf API
+EVENT_STREAM_STATE = 1
+EVENT_STREAM_EFFECTS = 3
+
+STATE_EVENT_ON = 1
+STATE_EVENT_BRIGHTNESS = 2
+STATE_EVENT_HUE = 3
+STATE_EVENT_SATURATION = 4
+STATE_EVENT_COLOR_TEMPERATURE = 5
+
+EFFECTS_EVENT_SELECT = 1
+
+# Nanoleaf reports brightness as 0-100 while Home Assistant uses 0-255
+BRIGHTNESS_TO_HASS = tuple(int(brightness * 2.55) for brightness in range(101))
+BRIGHTNESS_TO_NANOLEAF = tuple(int(brightness / 2.55) for brightness in range(256))
+
 SUPPORT_NANOLEAF = (
     SUPPORT_BRIGHTNESS
     | SUPPORT_COLOR_TEMP
@@ -56,18 +84,17 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up the Nanoleaf light."""
 
-    if DATA_NANOLEAF not in hass.data:
-        hass.data[DATA_NANOLEAF] = {}
+    hass.data.setdefault(DATA_NANOLEAF, {})
 
     token = ""
     if discovery_info is not None:
         host = discovery_info["host"]
-        name = None
-        device_id = discovery_info["properties"]["id"]
-
-        # if device already exists via config, skip discovery setup
+        # if device already exists via config or an earlier announcement,
+        # skip discovery setup before doing any further work
         if host in hass.data[DATA_NANOLEAF]:
             return
+        name = None
+        device_id = discovery_info["properties"]["id"]
         _LOGGER.info("Discovered a new Nanoleaf: %s", discovery_info)
         conf = load_json(hass.config.path(CONFIG_FILE))
         if host in conf and device_id not in conf:
@@ -113,6 +140,12 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
 class NanoleafLight(LightEntity):
     """Representation of a Nanoleaf Light."""
 
+    icon = ICON
+    min_mireds = 154
+    max_mireds = 833
+    should_poll = False
+    supported_features = SUPPORT_NANOLEAF
+
     def __init__(self, light, name):
         """Initialize an Nanoleaf light."""
         self._unique_id = light.serialNo
@@ -121,11 +154,22 @@ class NanoleafLight(LightEntity):
         self._color_temp = None
         self._effect = None
         self._effects_list = None
+        self._effects_set = None
+        self._event_listener = None
+        self._last_info = None
         self._light = light
         self._name = name
         self._hs_color = None
         self._state = None
 
+    async def async_added_to_hass(self):
+        """Start listening to the Nanoleaf event stream."""
+        self._event_listener = asyncio.create_task(self._listen_events())
+
+    async def async_will_remove_from_hass(self):
+        """Stop listening to the Nanoleaf event stream."""
+        self._event_listener.cancel()
+
     @property
     def available(self):
         """Return availability."""
@@ -135,15 +179,13 @@ class NanoleafLight(LightEntity):
     def brightness(self):
         """Return the brightness of the light."""
         if self._brightness is not None:
-            return int(self._brightness * 2.55)
+            return BRIGHTNESS_TO_HASS[self._brightness]
         return None
 
     @property
     def color_temp(self):
         """Return the current color temperature."""
-        if self._color_temp is not None:
-            return color_util.color_temperature_kelvin_to_mired(self._color_temp)
-        return None
+        return self._color_temp
 
     @property
     def effect(self):
@@ -155,16 +197,6 @@ class NanoleafLight(LightEntity):
         """Return the list of supported effects."""
         return self._effects_list
 
-    @property
-    def min_mireds(self):
-        """Return the coldest color_temp that this light supports."""
-        return 154
-
-    @property
-    def max_mireds(self):
-        """Return the warmest color_temp that this light supports."""
-        return 833
-
     @property
     def unique_id(self):
         """Return a unique ID."""
@@ -175,11 +207,6 @@ class NanoleafLight(LightEntity):
         """Return the display name of this light."""
         return self._name
 
-    @property
-    def icon(self):
-        """Return the icon to use in the frontend, if any."""
-        return ICON
-
     @property
     def is_on(self):
         """Return true if light is on."""
@@ -190,11 +217,6 @@ class NanoleafLight(LightEntity):
         """Return the color in HS."""
         return self._hs_color
 
-    @property
-    def supported_features(self):
-        """Flag supported features."""
-        return SUPPORT_NANOLEAF
-
     def turn_on(self, **kwargs):
         """Instruct the light to turn on."""
         brightness = kwargs.get(ATTR_BRIGHTNESS)
@@ -203,27 +225,29 @@ class NanoleafLight(LightEntity):
         effect = kwargs.get(ATTR_EFFECT)
         transition = kwargs.get(ATTR_TRANSITION)
 
+        new_state = {}
         if hs_color:
             hue, saturation = hs_color
-            self._light.hue = int(hue)
-            self._light.saturation = int(saturation)
+            new_state["hue"] = {"value": int(hue)}
+            new_state["sat"] = {"value": int(saturation)}
         if color_temp_mired:
-            self._light.color_temperature = mired_to_kelvin(color_temp_mired)
-
-        if transition:
-            if brightness:  # tune to the required brightness in n seconds
-                self._light.brightness_transition(
-                    int(brightness / 2.55), int(transition)
-                )
-            else:  # If brightness is not specified, assume full brightness
-                self._light.brightness_transition(100, int(transition))
+            new_state["ct"] = {"value": mired_to_kelvin(color_temp_mired)}
+
+        if transition:  # tune to the required brightness in n seconds
+            # If brightness is not specified, assume full brightness
+            new_state["brightness"] = {
+                "value": BRIGHTNESS_TO_NANOLEAF[brightness] if brightness else 100,
+                "duration": int(transition),
+            }
         else:  # If no transition is occurring, turn on the light
-            self._light.on = True
+            new_state["on"] = {"value": True}
             if brightness:
-                self._light.brightness = int(brightness / 2.55)
+                new_state["brightness"] = {"value": BRIGHTNESS_TO_NANOLEAF[brightness]}
+
+        self._light.state = new_state
 
         if effect:
-            if effect not in self._effects_list:
+            if effect not in self._effects_set:
                 raise ValueError(
                     f"Attempting to apply effect not in the effect list: '{effect}'"
                 )
@@ -237,26 +261,142 @@ class NanoleafLight(LightEntity):
         else:
             self._light.on = False
 
+    async def _listen_events(self):
+        """Push state updates from the Nanoleaf event stream."""
+        session = async_get_clientsession(self.hass)
+        url = (
+            f"http://{self._light.host}:{self._light.port}"
+            f"/api/v1/{self._light.token}/events"
+        )
+        params = {"id": f"{EVENT_STREAM_STATE},{EVENT_STREAM_EFFECTS}"}
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=STREAM_READ_TIMEOUT)
+        while True:
+            try:
+                async with session.get(
+                    url, params=params, timeout=timeout
+                ) as response:
+                    response.raise_for_status()
+                    # Resync in case updates were missed while disconnected
+                    await self.hass.async_add_executor_job(self.update)
+                    self.async_write_ha_state()
+                    event_id = None
+                    async for line in response.content:
+                        line = line.decode().strip()
+                        if line.startswith("id:"):
+                            event_id = int(line[3:])
+                        elif line.startswith("data:") and event_id is not None:
+                            self._handle_events(event_id, json.loads(line[5:]))
+                            self.async_write_ha_state()
+            except asyncio.TimeoutError:
+                # Nothing received within the read timeout: the stream may
+                # just be quiet, so reconnect right away without touching
+                # availability; a dead device fails the reconnect or resync
+                # and is handled below
+                continue
+            except (
+                aiohttp.ClientError,
+                NanoleafError,
+                KeyError,
+                TypeError,
+                ValueError,
+            ) as err:
+                if self._available:
+                    _LOGGER.error(
+                        "Lost connection to the event stream of %s (%s)",
+                        self.name,
+                        err,
+                    )
+                    self._available = False
+                    self.async_write_ha_state()
+            await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def _handle_events(self, event_id, data):
+        """Apply a batch of events from the device to the entity state."""
+        # A pushed change invalidates the cached poll response
+        self._last_info = None
+        for event in data["events"]:
+            attr = event["attr"]
+            value = event["value"]
+            if event_id == EVENT_STREAM_STATE:
+                if attr == STATE_EVENT_ON:
+                    self._state = value
+                elif attr == STATE_EVENT_BRIGHTNESS:
+                    self._brightness = value
+                elif attr == STATE_EVENT_HUE:
+                    _, saturation = self._hs_color or (0, 0)
+                    self._hs_color = value, saturation
+                elif attr == STATE_EVENT_SATURATION:
+                    hue, _ = self._hs_color or (0, 0)
+                    self._hs_color = hue, value
+                elif attr == STATE_EVENT_COLOR_TEMPERATURE:
+                    self._color_temp = color_util.color_temperature_kelvin_to_mired(
+                        value
+                    )
+            elif event_id == EVENT_STREAM_EFFECTS and attr == EFFECTS_EVENT_SELECT:
+                effect = (
+                    value if self._effects_set and value in self._effects_set else None
+                )
+                self._effect = effect
+                if effect is not None:
+                    # An active effect overrides the color attributes, same as
+                    # in update()
+                    self._color_temp = None
+                    self._hs_color = None
+
     def update(self):
         """Fetch new state data for this light."""
 
         try:
-            self._available = self._light.available
-            self._brightness = self._light.brightness
-            self._effects_list = self._light.effects
-            # Nanoleaf api returns non-existent effect named "*Solid*" when light set to solid color.
-            # This causes various issues with scening (see https://github.com/home-assistant/core/issues/36359).
-            # Until fixed at the library level, we should ensure the effect exists before saving to light properties
-            self._effect = (
-                self._light.effect if self._light.effect in self._effects_list else None
-            )
-            if self._effect is None:
-                self._color_temp = self._light.color_temperature
-                self._hs_color = self._light.hue, self._light.saturation
-            else:
-                self._color_temp = None
-                self._hs_color = None
-            self._state = self._light.on
+            info = self._light.info
         except Unavailable as err:
-            _LOGGER.error("Could not update status for %s (%s)", self.name, err)
-            self._available = False
+            if self._available:
+                _LOGGER.error("Could not update status for %s (%s)", self.name, err)
+                self._available = False
+            return
+
+        if info == self._last_info:
+            # Nothing changed since the last poll, skip reparsing the response
+            self._available = True
+            return
+
+        state = info["state"]
+        effects = info["effects"]
+
+        effects_list = effects["effectsList"]
+        effects_set = frozenset(effects_list)
+        # Nanoleaf api returns non-existent effect named "*Solid*" when light set to solid color.
+        # This causes various issues with scening (see https://github.com/home-assistant/core/issues/36359).
+        # Until fixed at the library level, we should ensure the effect exists before saving to light properties
+        effect = effects["select"]
+        if effect not in effects_set:
+            effect = None
+        if effect is None:
+            color_temp = color_util.color_temperature_kelvin_to_mired(
+                state["ct"]["value"]
+            )
+            hs_color = state["hue"]["value"], state["sat"]["value"]
+        else:
+            color_temp = None
+            hs_color = None
+
+        (
+            self._available,
+            self._brightness,
+            self._color_temp,
+            self._effect,
+            self._effects_list,
+            self._effects_set,
+            self._hs_color,
+            self._last_info,
+            self._state,
+        ) = (
+            True,
+            state["brightness"]["value"],
+            color_temp,
+            effect,
+            effects_list,
+            effects_set,
+            hs_color,
+            info,
+            state["on"]["value"],
+        )